@@ -3,12 +3,27 @@ import json
 import os
 import sys
 
+from validate_od_data import (
+    ValidationReport, check_input_exists, check_counts, check_code_format,
+    check_legacy_codes, check_mass_conservation, check_code_coverage, check_yoy_outliers,
+)
+
 # Configuration
 DATA_DIR = "datasets/popMove/houseHold"
 OUTPUT_FILE = "dashboard/public/od_data.json"
 
+def write_report_or_exit(report):
+    # Fail the build on hard validation errors before anything is exported
+    report.write()
+    if report.errors:
+        print(f"Error: {len(report.errors)} validation check(s) failed. Aborting export.")
+        for c in report.errors:
+            print(f" - {c['stage']}/{c['check']}: {c['failed']} issue(s)")
+        sys.exit(1)
+
 def process_od_data():
     print("Starting OD data processing...")
+    report = ValidationReport()
     
     # Define columns: 
     # V1(Sido_In), V2(Sgg_In), V7(Sido_Out), V8(Sgg_Out), V15(Count)
@@ -36,22 +51,26 @@ def process_od_data():
     # 1. Process 2023 Data
     print("Loading 2023 data...")
     path_2023 = os.path.join(DATA_DIR, "2023.csv")
-    if not os.path.exists(path_2023):
+    if not check_input_exists(report, 'load_2023', path_2023):
         print(f"Error: 2023 file not found at {path_2023}")
-        return
+        write_report_or_exit(report)
         
     df_raw_2023 = pd.read_csv(path_2023, header=None, usecols=cols, names=col_names, dtype=col_types)
+    check_counts(report, 'load_2023', df_raw_2023)
+    check_code_format(report, 'load_2023', df_raw_2023)
     agg_2023 = process_df(df_raw_2023)
     print(f"2023 processed records: {len(agg_2023)}")
 
     # 2. Process 2024 Data
     print("Loading 2024 data...")
     path_2024 = os.path.join(DATA_DIR, "2024.csv")
-    if not os.path.exists(path_2024):
+    if not check_input_exists(report, 'load_2024', path_2024):
         print(f"Error: 2024 file not found at {path_2024}")
-        return
+        write_report_or_exit(report)
 
     df_raw_2024 = pd.read_csv(path_2024, header=None, usecols=cols, names=col_names, dtype=col_types)
+    check_counts(report, 'load_2024', df_raw_2024)
+    check_code_format(report, 'load_2024', df_raw_2024)
     agg_2024 = process_df(df_raw_2024)
     print(f"2024 processed records: {len(agg_2024)}")
     
@@ -59,6 +78,9 @@ def process_od_data():
     # [NEW] Standardize 2023 Data to match 2024 Codes
     # ---------------------------------------------------------
     print("Standardizing 2023 data to 2024 codes...")
+    # Keep totals before standardization for the mass conservation check
+    agg_2023_before = agg_2023[['count', 'hh_cnt']].copy()
+    rounding_drift = None
     
     # 1. Calculate Bucheon Ratios from 2024 Data
     # Bucheon Districts: Wonmi(41192), Sosa(41194), Ojeong(41196)
@@ -162,9 +184,11 @@ def process_od_data():
     # Combine
     if split_rows:
         df_split = pd.concat(split_rows)
+        split_exact = df_split[['count', 'hh_cnt']].sum()
         # Round counts to int
         df_split['count'] = df_split['count'].round().astype(int)
         df_split['hh_cnt'] = df_split['hh_cnt'].round().astype(int)
+        rounding_drift = df_split[['count', 'hh_cnt']].sum() - split_exact
         
         # Combine with preserved rows
         agg_2023 = pd.concat([df_preserved, df_split], ignore_index=True)
@@ -183,6 +207,10 @@ def process_od_data():
     
     print(f"2023 standardized records: {len(agg_2023)}")
 
+    check_counts(report, 'standardize_2023', agg_2023, cols=('count', 'hh_cnt'))
+    check_legacy_codes(report, 'standardize_2023', agg_2023)
+    check_mass_conservation(report, 'standardize_2023', agg_2023_before, agg_2023, bucheon_ratios, rounding_drift)
+
     # 3. Merge and Calculate Diff
     print("Merging datasets...")
     # Left join on 2024 data
@@ -200,6 +228,9 @@ def process_od_data():
     
     # Calculate Diff
     merged['diff'] = merged['count'] - merged['count_prev']
+
+    # Outer join inside the check: the left join above hides flows that dropped to zero in 2024
+    check_yoy_outliers(report, 'merge', agg_2024, agg_2023)
     
     # 4. Build JSON Structure
     print("Building JSON structure...")
@@ -322,26 +353,22 @@ def process_od_data():
         print(f"Generated code_mapping.json with {matched_count} matches.")
 
         # ---------------------------------------------------------
-        # [NEW] Validation: Check for Missing Sigungu
+        # Validation: Code coverage between OD data, code_mapping and GeoJSON
         # ---------------------------------------------------------
         print("\n--- Validating Region Codes ---")
-        missing_codes = []
-        for feature in geojson['features']:
-            c_code = feature['properties']['SIGUNGU_CD']
-            c_name = feature['properties']['SIGUNGU_NM']
-            sido_c = c_code[:2]
-            sido_nm = census_sido_map.get(sido_c, "")
-            full_name_g = f"{sido_nm} {c_name}".strip()
-
-            # 1. Is it in Code Mapping?
-            # If mapped, get the Admin Code. 
-            if c_code not in code_mapping:
-                missing_codes.append(f"{full_name_g} ({c_code})")
+        geo_names = {
+            feature['properties']['SIGUNGU_CD']: feature['properties']['SIGUNGU_NM']
+            for feature in geojson['features']
+        }
+        od_codes = pd.concat([merged['source'], merged['target']]).unique()
+        missing_codes = check_code_coverage(report, 'code_mapping', od_codes, code_mapping, list(geo_names))
 
-        if missing_codes:
+        if len(missing_codes):
             print(f"Warning: {len(missing_codes)} regions in GeoJSON are NOT mapped to Admin Codes:")
-            for m in missing_codes[:20]: # Print top 20
-                print(f" - {m}")
+            for c_code in missing_codes[:20]: # Print top 20
+                sido_nm = census_sido_map.get(c_code[:2], "")
+                full_name_g = f"{sido_nm} {geo_names[c_code]}".strip()
+                print(f" - {full_name_g} ({c_code})")
             if len(missing_codes) > 20:
                 print(f" ... and {len(missing_codes)-20} more.")
         else:
@@ -352,6 +379,10 @@ def process_od_data():
         print(f"Error generating mapping: {e}")
         import traceback
         traceback.print_exc()
+        # Coverage checks were skipped, so the mapping step itself counts as a failed check
+        report.add_exception('code_mapping', e)
+
+    write_report_or_exit(report)
 
     # 5. Export Data
     print(f"Exporting to {OUTPUT_FILE}...")
@@ -0,0 +1,55 @@
+import json
+import os
+
+import pytest
+
+from process_od_data import DATA_DIR, OUTPUT_FILE, process_od_data
+from validate_od_data import REPORT_FILE
+
+
+def write_csv(path, rows):
+    # Raw layout: V1/V2 target sido/sgg, V7/V8 source sido/sgg, V15 count
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        for target, source, count in rows:
+            row = [target[:2], target[2:]] + ['0'] * 4 + [source[:2], source[2:]] + ['0'] * 6 + [str(count)]
+            f.write(','.join(row) + '\n')
+
+
+def read_report():
+    with open(REPORT_FILE, encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_missing_input_fails_build(tree):
+    write_csv(os.path.join(DATA_DIR, '2023.csv'), [('11010', '11020', 1)])
+
+    with pytest.raises(SystemExit) as exc:
+        process_od_data()
+
+    assert exc.value.code == 1
+    assert not os.path.exists(OUTPUT_FILE)
+    report = read_report()
+    assert report['ok'] is False
+    assert [(c['stage'], c['check']) for c in report['checks'] if c['status'] == 'error'] == \
+        [('load_2024', 'input_exists')]
+
+
+def test_mapping_failure_fails_build(tree):
+    # No 2024_description.xlsx, so the code mapping step raises
+    write_csv(os.path.join(DATA_DIR, '2023.csv'), [('11010', '41190', 2), ('45110', '11010', 1)])
+    write_csv(os.path.join(DATA_DIR, '2024.csv'), [('11010', '41192', 2), ('52110', '11010', 1)])
+
+    with pytest.raises(SystemExit) as exc:
+        process_od_data()
+
+    assert exc.value.code == 1
+    assert not os.path.exists(OUTPUT_FILE)
+    errors = [c for c in read_report()['checks'] if c['status'] == 'error']
+    assert [(c['stage'], c['check']) for c in errors] == [('code_mapping', 'exception')]
@@ -0,0 +1,145 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from validate_od_data import (
+    ValidationReport, check_counts, check_code_format, check_legacy_codes,
+    check_mass_conservation, check_code_coverage, check_yoy_outliers,
+)
+
+
+@pytest.fixture
+def report():
+    return ValidationReport()
+
+
+def status(report, name):
+    return next(c['status'] for c in report.checks if c['check'] == name)
+
+
+def raw_frame(sido, sgg):
+    return pd.DataFrame({
+        'source_sido': sido, 'source_sgg': sgg,
+        'target_sido': ['11'] * len(sido), 'target_sgg': ['010'] * len(sido),
+    })
+
+
+def flows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    prev = rng.integers(200, 500, n).astype(float)
+    curr = np.round(prev * rng.normal(1, 0.05, n))
+    codes = [f'{i:05d}' for i in range(n)]
+    prev_df = pd.DataFrame({'source': codes, 'target': '11010', 'count': prev, 'est': 0})
+    curr_df = pd.DataFrame({'source': codes, 'target': '11010', 'count': curr})
+    return curr_df, prev_df
+
+
+def test_counts_pass(report):
+    check_counts(report, 'load', pd.DataFrame({'count': [1.0, 0.0, 5.0]}))
+    assert status(report, 'counts') == 'pass'
+
+
+@pytest.mark.parametrize('value', [np.nan, -1.0])
+def test_counts_nan_or_negative(report, value):
+    check_counts(report, 'load', pd.DataFrame({'count': [1.0, value]}))
+    assert status(report, 'counts') == 'error'
+    assert report.checks[0]['failed'] == 1
+
+
+def test_code_format_pass(report):
+    check_code_format(report, 'load', raw_frame(['11', '41'], ['020', '192']))
+    assert status(report, 'code_format') == 'pass'
+
+
+def test_code_format_missing_code_in_raw_frame(report):
+    check_code_format(report, 'load', raw_frame(['11', None, '4'], ['020', '192', '1x']))
+    assert status(report, 'code_format') == 'error'
+    detail = report.checks[0]['detail']['source']
+    assert detail['invalid'] == 2
+    assert '<missing>' in detail['sample']
+
+
+def test_legacy_codes_pass(report):
+    check_legacy_codes(report, 'std', pd.DataFrame({'source': ['41192', '52110'], 'target': ['27720', '11010']}))
+    assert status(report, 'legacy_codes') == 'pass'
+
+
+def test_legacy_codes_left_over(report):
+    check_legacy_codes(report, 'std', pd.DataFrame({'source': ['41190', '11010'], 'target': ['11010', '45110']}))
+    assert status(report, 'legacy_codes') == 'error'
+    assert report.checks[0]['detail']['legacy_codes'] == ['41190', '45110']
+
+
+def test_mass_conservation_pass_with_rounding(report):
+    before = pd.DataFrame({'count': [10.0, 3.0], 'hh_cnt': [4, 1]})
+    after = pd.DataFrame({'count': [10.0, 3.2], 'hh_cnt': [4, 1]})
+    ratios = pd.Series({'41192': 0.5, '41194': 0.3, '41196': 0.2})
+    check_mass_conservation(report, 'std', before, after, ratios, pd.Series({'count': 0.2, 'hh_cnt': 0.0}))
+    assert status(report, 'split_ratios') == 'pass'
+    assert status(report, 'mass_conservation') == 'pass'
+
+
+def test_mass_conservation_invalid_ratios(report):
+    before = pd.DataFrame({'count': [10.0, 3.0], 'hh_cnt': [4, 1]})
+    ratios = pd.Series({'41192': 0.5, '41194': 0.6})
+    check_mass_conservation(report, 'std', before, before.copy(), ratios)
+    assert status(report, 'split_ratios') == 'error'
+    assert status(report, 'mass_conservation') == 'pass'
+
+
+def test_mass_conservation_lost_row(report):
+    before = pd.DataFrame({'count': [10.0, 3.0], 'hh_cnt': [4, 1]})
+    after = before.iloc[:1]
+    ratios = pd.Series({'41192': 0.5, '41194': 0.3, '41196': 0.2})
+    check_mass_conservation(report, 'std', before, after, ratios, pd.Series({'count': 0.2, 'hh_cnt': 0.0}))
+    assert status(report, 'split_ratios') == 'pass'
+    assert status(report, 'mass_conservation') == 'error'
+
+
+def test_code_coverage_pass(report):
+    missing = check_code_coverage(report, 'map', ['41220', '11010'],
+                                  {'31070': '41220', '11010': '11010'}, ['31070', '11010'])
+    assert len(missing) == 0
+    assert all(c['status'] == 'pass' for c in report.checks)
+
+
+def test_code_coverage_unmapped_geo(report):
+    missing = check_code_coverage(report, 'map', ['11010'], {'11010': '11010'}, ['11010', '31070'])
+    assert missing.tolist() == ['31070']
+    assert status(report, 'geo_unmapped') == 'warning'
+
+
+def test_code_coverage_mapped_admin_code_without_od(report):
+    # Deleted Pyeongtaek code picked instead of the active 41220
+    check_code_coverage(report, 'map', ['41220', '11010'],
+                        {'31070': '41330', '11010': '11010'}, ['31070', '11010'])
+    assert status(report, 'mapping_not_in_od') == 'error'
+    assert status(report, 'od_not_in_geo') == 'warning'
+
+
+def test_yoy_outliers_pass(report):
+    curr_df, prev_df = flows(200)
+    check_yoy_outliers(report, 'merge', curr_df, prev_df)
+    assert status(report, 'yoy_outliers') == 'pass'
+
+
+def test_yoy_outliers_dropped_flow(report):
+    curr_df, prev_df = flows(200)
+    prev_df.loc[0, 'count'] = 3000
+    check_yoy_outliers(report, 'merge', curr_df.iloc[1:], prev_df)
+    assert status(report, 'yoy_outliers') == 'warning'
+    detail = report.checks[0]['detail']
+    assert detail['dropped_flows'] == 1
+    assert detail['sample'][0]['source'] == '00000'
+
+
+def test_report_write(report, tmp_path):
+    check_counts(report, 'load', pd.DataFrame({'count': [np.nan]}))
+    report.add_exception('code_mapping', FileNotFoundError('2024_description.xlsx'))
+    path = tmp_path / 'report.json'
+    report.write(str(path))
+    data = json.loads(path.read_text(encoding='utf-8'))
+    assert data['ok'] is False
+    assert data['errors'] == 2
@@ -0,0 +1,250 @@
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Configuration
+REPORT_FILE = "export/validation_report.json"
+
+# Codes that must not survive standardization of 2023 data to 2024 codes
+# Bucheon(41190) is split into 41192/41194/41196, Gunwi(47720) -> 27720, Jeonbuk 45xxx -> 52xxx
+LEGACY_CODES = ['41190', '47720']
+LEGACY_PREFIXES = ('45',)
+
+# YoY outlier detection (modified z-score on log ratio, based on median/MAD)
+OUTLIER_Z_THRESHOLD = 3.5
+OUTLIER_MIN_COUNT = 100
+OUTLIER_SAMPLE_SIZE = 20
+
+
+class ValidationReport:
+    """Collects check results from every pipeline step and writes them as JSON."""
+
+    def __init__(self):
+        self.checks = []
+
+    def add(self, stage, name, severity, failed, detail, started):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        status = 'pass' if failed == 0 else severity
+        self.checks.append({
+            'stage': stage,
+            'check': name,
+            'status': status,
+            'failed': int(failed),
+            'elapsed_ms': round(elapsed_ms, 3),
+            'detail': detail,
+        })
+        label = {'pass': 'OK', 'warning': 'WARN', 'error': 'ERROR'}[status]
+        print(f"[{label}] {stage}/{name}: {failed} issue(s) ({elapsed_ms:.2f} ms)")
+
+    def add_exception(self, stage, exc):
+        """Record a step that raised, so its skipped checks fail the build instead of passing silently."""
+        self.add(stage, 'exception', 'error', 1,
+                 {'type': type(exc).__name__, 'message': str(exc)}, time.perf_counter())
+
+    @property
+    def errors(self):
+        return [c for c in self.checks if c['status'] == 'error']
+
+    @property
+    def warnings(self):
+        return [c for c in self.checks if c['status'] == 'warning']
+
+    def write(self, path=REPORT_FILE):
+        output_dir = os.path.dirname(path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir, exist_ok=True)
+
+        report = {
+            'ok': not self.errors,
+            'errors': len(self.errors),
+            'warnings': len(self.warnings),
+            'elapsed_ms': round(sum(c['elapsed_ms'] for c in self.checks), 3),
+            'checks': self.checks,
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Validation report written to {path} "
+              f"({report['errors']} errors, {report['warnings']} warnings, {report['elapsed_ms']:.2f} ms)")
+
+
+def check_input_exists(report, stage, path):
+    """Hard error if an input file is missing. Returns whether it exists."""
+    started = time.perf_counter()
+    exists = os.path.exists(path)
+    report.add(stage, 'input_exists', 'error', int(not exists), {'path': path}, started)
+    return exists
+
+
+def check_counts(report, stage, df, cols=('count',)):
+    """Hard error on NaN or negative values in the count columns."""
+    started = time.perf_counter()
+    cols = [c for c in cols if c in df.columns]
+    values = df[cols].to_numpy(dtype=float)
+
+    nan_mask = np.isnan(values)
+    neg_mask = values < 0  # NaN compares False, so the masks are disjoint
+    nan_per_col = nan_mask.sum(axis=0)
+    neg_per_col = neg_mask.sum(axis=0)
+
+    detail = {
+        'rows': int(len(df)),
+        'nan': {c: int(n) for c, n in zip(cols, nan_per_col)},
+        'negative': {c: int(n) for c, n in zip(cols, neg_per_col)},
+    }
+    report.add(stage, 'counts', 'error', int(nan_per_col.sum() + neg_per_col.sum()), detail, started)
+
+
+def check_code_format(report, stage, df, prefixes=('source', 'target')):
+    """
+    Hard error on region codes (sido + sgg) that are missing or not 5-digit strings.
+    Codes are built from the raw <prefix>_sido/<prefix>_sgg columns, before groupby drops missing values.
+    The regex runs on the distinct codes only; failures are counted back to rows with bincount.
+    """
+    started = time.perf_counter()
+    detail = {}
+    failed = 0
+    for prefix in prefixes:
+        sido_labels, sido_uniques = pd.factorize(df[f'{prefix}_sido'], use_na_sentinel=False)
+        sgg_labels, sgg_uniques = pd.factorize(df[f'{prefix}_sgg'], use_na_sentinel=False)
+        n_sgg = len(sgg_uniques)
+        labels, pairs = pd.factorize(sido_labels.astype(np.int64) * n_sgg + sgg_labels)
+
+        sido = pd.Series(np.asarray(sido_uniques, dtype=object)[pairs // n_sgg])
+        sgg = pd.Series(np.asarray(sgg_uniques, dtype=object)[pairs % n_sgg])
+        uniques = sido + sgg
+        bad = ~uniques.str.fullmatch(r'\d{5}', na=False).to_numpy(dtype=bool)  # missing codes count as invalid
+        rows_per_code = np.bincount(labels, minlength=len(uniques))
+        n_bad = int(rows_per_code[bad].sum())
+        failed += n_bad
+        detail[prefix] = {
+            'invalid': n_bad,
+            'sample': uniques[bad].fillna('<missing>').astype(str).unique().tolist()[:OUTLIER_SAMPLE_SIZE],
+        }
+    report.add(stage, 'code_format', 'error', failed, detail, started)
+
+
+def check_legacy_codes(report, stage, df, cols=('source', 'target')):
+    """Hard error if pre-2024 codes remain after standardization."""
+    started = time.perf_counter()
+    codes = pd.unique(df[list(cols)].to_numpy().ravel())
+    codes = pd.Series(codes, dtype=str)
+    legacy = codes[codes.isin(LEGACY_CODES) | codes.str.startswith(LEGACY_PREFIXES)]
+    detail = {'legacy_codes': sorted(legacy.tolist())}
+    report.add(stage, 'legacy_codes', 'error', len(legacy), detail, started)
+
+
+def check_mass_conservation(report, stage, before, after, ratios, rounding_drift=None, cols=('count', 'hh_cnt')):
+    """
+    Hard error if the Bucheon split ratios do not sum to 1, or if column totals change through standardization.
+    rounding_drift is (rounded - unrounded) totals of the split rows; it is removed before comparing,
+    so rounding is reported separately and any remaining drift is a logic error.
+    """
+    started = time.perf_counter()
+    ratio_sum = float(np.sum(ratios))
+    report.add(stage, 'split_ratios', 'error', int(not np.isclose(ratio_sum, 1.0, rtol=0, atol=1e-9)),
+               {'ratios': {str(k): float(v) for k, v in dict(ratios).items()}, 'sum': ratio_sum}, started)
+
+    started = time.perf_counter()
+    cols = list(cols)
+    totals_before = before[cols].sum().to_numpy(dtype=float)
+    totals_after = after[cols].sum().to_numpy(dtype=float)
+    if rounding_drift is None:
+        rounding = np.zeros(len(cols))
+    else:
+        rounding = pd.Series(rounding_drift).reindex(cols).fillna(0).to_numpy(dtype=float)
+    drift = totals_after - rounding - totals_before
+    violated = ~np.isclose(drift, 0, rtol=0, atol=1e-6 * np.maximum(1, np.abs(totals_before)))
+
+    detail = {
+        'columns': {
+            c: {'before': float(b), 'after': float(a), 'rounding_drift': float(r), 'drift': float(d)}
+            for c, b, a, r, d in zip(cols, totals_before, totals_after, rounding, drift)
+        },
+    }
+    report.add(stage, 'mass_conservation', 'error', int(violated.sum()), detail, started)
+
+
+def check_code_coverage(report, stage, od_codes, code_mapping, geo_codes):
+    """
+    Set checks between OD codes (admin), code_mapping (census -> admin) and GeoJSON (census).
+    Returns the GeoJSON codes that have no admin mapping.
+    """
+    started = time.perf_counter()
+    od_codes = np.unique(np.asarray(od_codes, dtype=str))
+    geo_codes = np.unique(np.asarray(geo_codes, dtype=str))
+    map_keys = np.asarray(list(code_mapping.keys()), dtype=str)
+    map_values = np.asarray(list(code_mapping.values()), dtype=str)
+
+    unmapped_geo = np.setdiff1d(geo_codes, map_keys)
+    report.add(stage, 'geo_unmapped', 'warning', len(unmapped_geo),
+               {'codes': unmapped_geo.tolist()}, started)
+
+    # Admin codes with no flows, e.g. a deleted code picked instead of the active one (Pyeongtaek 41330 vs 41220)
+    started = time.perf_counter()
+    mapped_without_od = np.setdiff1d(map_values, od_codes)
+    report.add(stage, 'mapping_not_in_od', 'error', len(mapped_without_od),
+               {'codes': mapped_without_od.tolist()}, started)
+
+    started = time.perf_counter()
+    values, counts = np.unique(map_values, return_counts=True)
+    duplicated = values[counts > 1]
+    report.add(stage, 'mapping_duplicate_targets', 'warning', len(duplicated),
+               {'codes': duplicated.tolist()}, started)
+
+    started = time.perf_counter()
+    od_without_geo = np.setdiff1d(od_codes, map_values)
+    report.add(stage, 'od_not_in_geo', 'warning', len(od_without_geo),
+               {'codes': od_without_geo.tolist()}, started)
+
+    return unmapped_geo
+
+
+def check_yoy_outliers(report, stage, curr_df, prev_df):
+    """
+    Warn on flows whose year-over-year change is implausible.
+    Scores an outer join of both years, so flows that disappeared in the current year are included.
+    Uses a modified z-score of log(count) - log(count_prev) so large and small flows are comparable.
+    """
+    started = time.perf_counter()
+    keys = ['source', 'target']
+    prev_cols = keys + [c for c in ('count', 'est') if c in prev_df.columns]
+    both = pd.merge(curr_df[keys + ['count']], prev_df[prev_cols], on=keys,
+                    how='outer', suffixes=('', '_prev'))
+
+    curr = both['count'].fillna(0).to_numpy(dtype=float)
+    prev = both['count_prev'].fillna(0).to_numpy(dtype=float)
+    log_ratio = np.log1p(curr) - np.log1p(prev)
+
+    median = np.median(log_ratio) if len(log_ratio) else 0.0
+    mad = np.median(np.abs(log_ratio - median)) if len(log_ratio) else 0.0
+    if mad > 0:
+        z = 0.6745 * (log_ratio - median) / mad
+    else:
+        z = np.zeros_like(log_ratio)
+
+    mask = (np.abs(z) > OUTLIER_Z_THRESHOLD) & (np.maximum(curr, prev) >= OUTLIER_MIN_COUNT)
+    idx = np.flatnonzero(mask)
+    top = idx[np.argsort(-np.abs(z[idx]))][:OUTLIER_SAMPLE_SIZE]
+
+    sample = both.iloc[top][keys].copy()
+    sample['count'] = curr[top].astype(int)
+    sample['count_prev'] = prev[top].astype(int)
+    sample['diff'] = sample['count'] - sample['count_prev']
+    sample['z'] = np.round(z[top], 2)
+    if 'est' in both.columns:
+        sample['est'] = both['est'].fillna(0).to_numpy(dtype=int)[top]
+
+    detail = {
+        'rows': int(len(both)),
+        'dropped_flows': int(((curr == 0) & (prev > 0)).sum()),
+        'new_flows': int(((curr > 0) & (prev == 0)).sum()),
+        'median_log_ratio': float(median),
+        'mad': float(mad),
+        'z_threshold': OUTLIER_Z_THRESHOLD,
+        'min_count': OUTLIER_MIN_COUNT,
+        'sample': json.loads(sample.to_json(orient='records')),
+    }
+    report.add(stage, 'yoy_outliers', 'warning', len(idx), detail, started)